@@ -1,25 +1,8 @@
 # agents/analyzer_agent.py
 
-from dotenv import load_dotenv
-import google.generativeai as genai
-import os
-from utils.logger_config import setup_logger
-import uvicorn
-from google.adk.agents import Agent
-from google.adk.a2a.utils.agent_to_a2a import to_a2a
 import sys
+from utils.gemini_config import lazy_agent_module
 sys.path.append("..")
-load_dotenv()
-
-# Prefer GOOGLE_API_KEY (used by ADK) but fall back to GEMINI_API_KEY for flexibility
-GEMINI_API_KEY = os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
-
-if not GEMINI_API_KEY:
-    raise ValueError(
-        "No Gemini API key found. Set GOOGLE_API_KEY or GEMINI_API_KEY in your environment or .env file."
-    )
-
-genai.configure(api_key=GEMINI_API_KEY)
 
 
 VULN_ANALYSIS_INSTRUCTION = """
@@ -66,18 +49,22 @@ Output:
 """
 
 
-root_agent = Agent(
-    name="analyzer_agent",
-    model="gemini-2.5-pro",
-    description="Analyzes a gitingest RepoDigest JSON and returns a repo-level vulnerability report JSON.",
-    instruction=VULN_ANALYSIS_INSTRUCTION,
-    tools=[],  # pure LLM; the "tool" is just its reasoning over the JSON
-)
+def _build_agent():
+    from google.adk.agents import Agent
+
+    return Agent(
+        name="analyzer_agent",
+        model="gemini-2.5-pro",
+        description="Analyzes a gitingest RepoDigest JSON and returns a repo-level vulnerability report JSON.",
+        instruction=VULN_ANALYSIS_INSTRUCTION,
+        tools=[],  # pure LLM; the "tool" is just its reasoning over the JSON
+    )
+
 
-# Expose as A2A server
-a2a_app = to_a2a(root_agent, port=8002)
+build_a2a_app, __getattr__ = lazy_agent_module(_build_agent, port=8002)
 
 
 if __name__ == "__main__":
     # Run with: python -m uvicorn agents.analyzer_agent:a2a_app --reload --port 8002
-    uvicorn.run(a2a_app, host="0.0.0.0", port=8002)
+    import uvicorn
+    uvicorn.run(build_a2a_app(), host="0.0.0.0", port=8002)
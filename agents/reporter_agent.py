@@ -1,27 +1,11 @@
 # agents/reporter_agent.py
 
-import uvicorn
-from google.adk.agents import Agent
-from google.adk.a2a.utils.agent_to_a2a import to_a2a
-import os
-import google.generativeai as genai
 import sys
 sys.path.append("..")
+from utils.gemini_config import lazy_agent_module
 from utils.logger_config import setup_logger
-from dotenv import load_dotenv
-load_dotenv()
 logger = setup_logger("ReporterAgent")
 
-# Prefer GOOGLE_API_KEY (used by ADK) but fall back to GEMINI_API_KEY for flexibility
-GEMINI_API_KEY = os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
-
-if not GEMINI_API_KEY:
-    raise ValueError(
-        "No Gemini API key found. Set GOOGLE_API_KEY or GEMINI_API_KEY in your environment or .env file."
-    )
-
-genai.configure(api_key=GEMINI_API_KEY)
-
 
 REPORT_FORMATTER_INSTRUCTION = """
 You are a security report writer.
@@ -57,17 +41,22 @@ Output:
 """
 
 
-root_agent = Agent(
-    name="reporter_agent",
-    model="gemini-2.0-flash",
-    description="Formats a repo vulnerability JSON into a developer-friendly Markdown report.",
-    instruction=REPORT_FORMATTER_INSTRUCTION,
-    tools=[],
-)
+def _build_agent():
+    from google.adk.agents import Agent
+
+    return Agent(
+        name="reporter_agent",
+        model="gemini-2.0-flash",
+        description="Formats a repo vulnerability JSON into a developer-friendly Markdown report.",
+        instruction=REPORT_FORMATTER_INSTRUCTION,
+        tools=[],
+    )
+
 
-a2a_app = to_a2a(root_agent, port=8003)
+build_a2a_app, __getattr__ = lazy_agent_module(_build_agent, port=8003)
 
 
 if __name__ == "__main__":
     # Run with: python -m uvicorn agents.reporter_agent:a2a_app --reload --port 8003
-    uvicorn.run(a2a_app, host="0.0.0.0", port=8003)
+    import uvicorn
+    uvicorn.run(build_a2a_app(), host="0.0.0.0", port=8003)
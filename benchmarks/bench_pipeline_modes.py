@@ -0,0 +1,137 @@
+# benchmarks/bench_pipeline_modes.py
+"""
+Compare end-to-end scan time of the A2A (distributed) and embedded
+(single-process) pipeline modes.
+
+Each mode reports three costs separately:
+- startup: launching the three uvicorn agent servers until their agent cards
+  are served (A2A with --start-servers only; otherwise servers are assumed to
+  be running already and startup is NOT measured),
+- setup: agent-card discovery for A2A, importing and building the three
+  agents for embedded,
+- scans: the pipeline runs themselves ("first" includes any remaining
+  warm-up, e.g. embedded runner creation).
+
+Run with: python -m benchmarks.bench_pipeline_modes --url <repo> --runs 3 --start-servers
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+import orchestrator
+from orchestrator import AGENT_URLS, SCAN_MODES, run_scan
+from utils.logger_config import setup_logger
+
+logger = setup_logger("BenchModes")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+AGENT_MODULES = ("scanner_agent", "analyzer_agent", "reporter_agent")
+
+
+async def _wait_until_ready(urls, procs: list[subprocess.Popen], timeout: float) -> None:
+    import httpx
+
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient(timeout=2.0) as client:
+        for url in urls:
+            while True:
+                try:
+                    resp = await client.get(f"{url}/.well-known/agent-card.json")
+                    if resp.status_code == 200:
+                        break
+                except httpx.HTTPError:
+                    pass
+                if any(p.poll() is not None for p in procs):
+                    raise RuntimeError("an agent server exited during startup")
+                if time.perf_counter() > deadline:
+                    raise TimeoutError(f"{url} not ready after {timeout:.0f}s")
+                await asyncio.sleep(0.1)
+
+
+async def _start_servers(timeout: float) -> tuple[list[subprocess.Popen], float]:
+    """Launch the three agent servers and time until all agent cards are served."""
+    t0 = time.perf_counter()
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", f"agents.{name}:a2a_app",
+             "--port", url.rsplit(":", 1)[1]],
+            cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        for name, url in zip(AGENT_MODULES, AGENT_URLS)
+    ]
+    try:
+        await _wait_until_ready(AGENT_URLS, procs, timeout)
+    except BaseException:
+        _stop_servers(procs)
+        raise
+    return procs, time.perf_counter() - t0
+
+
+def _stop_servers(procs: list[subprocess.Popen]) -> None:
+    for p in procs:
+        p.terminate()
+    for p in procs:
+        p.wait()
+
+
+async def _bench_mode(repo_url: str, mode: str, runs: int,
+                      start_servers: bool, ready_timeout: float) -> dict:
+    procs, startup = [], None
+    if mode == "a2a" and start_servers:
+        procs, startup = await _start_servers(ready_timeout)
+        logger.info(f"[{mode}] servers ready in {startup:.2f}s")
+    try:
+        t0 = time.perf_counter()
+        if mode == "a2a":
+            # Cold: nothing else in this process has discovered the agents yet.
+            await orchestrator._a2a_stages()
+        else:
+            await orchestrator._embedded_stages()
+        setup = time.perf_counter() - t0
+        logger.info(f"[{mode}] setup in {setup:.2f}s")
+
+        timings = []
+        for i in range(runs):
+            t0 = time.perf_counter()
+            await run_scan(repo_url, mode=mode)
+            timings.append(time.perf_counter() - t0)
+            logger.info(f"[{mode}] run {i+1}/{runs}: {timings[-1]:.2f}s")
+    finally:
+        _stop_servers(procs)
+    return {"startup": startup, "setup": setup, "runs": timings}
+
+
+async def main(repo_url: str, modes: list[str], runs: int,
+               start_servers: bool, ready_timeout: float) -> None:
+    results = {}
+    # One event loop for every run so cached clients/runners are reused,
+    # like a long-lived Streamlit or CI process would.
+    for mode in modes:
+        results[mode] = await _bench_mode(
+            repo_url, mode, runs, start_servers, ready_timeout)
+
+    print(f"\n{'mode':<10} {'startup':>8} {'setup':>8} {'first':>8} {'median':>8} {'min':>8}")
+    for mode, r in results.items():
+        t = r["runs"]
+        startup = f"{r['startup']:>7.2f}s" if r["startup"] is not None else f"{'n/a':>8}"
+        print(f"{mode:<10} {startup} {r['setup']:>7.2f}s {t[0]:>7.2f}s "
+              f"{statistics.median(t):>7.2f}s {min(t):>7.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark A2A vs embedded pipeline modes")
+    parser.add_argument(
+        "--url", default="https://github.com/ADITYAMAHAKALI/gdg-vuln-sample-repo")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--modes", nargs="+", choices=SCAN_MODES,
+                        default=list(SCAN_MODES))
+    parser.add_argument("--start-servers", action="store_true",
+                        help="launch the A2A agent servers and include their startup time")
+    parser.add_argument("--ready-timeout", type=float, default=60.0,
+                        help="seconds to wait for started servers to serve their agent cards")
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.modes, args.runs,
+                     args.start_servers, args.ready_timeout))
@@ -0,0 +1,71 @@
+# benchmarks/bench_startup.py
+"""
+Measure cold-start time of the orchestrator CLI and of each agent server.
+
+Every target runs in a fresh interpreter so nothing is warm in sys.modules.
+Building an agent's A2A app never calls Gemini, so a placeholder API key is
+used when none is set.
+
+Run with: python -m benchmarks.bench_startup --runs 5 [--max-seconds 3]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = {
+    "orchestrator --help": [sys.executable, "orchestrator.py", "--help"],
+    "import orchestrator": [sys.executable, "-c", "import orchestrator"],
+    "import scan_service": [sys.executable, "-c", "import utils.scan_service"],
+    **{
+        f"{name} a2a_app": [sys.executable, "-c",
+                            f"from agents.{name} import a2a_app"]
+        for name in ("scanner_agent", "analyzer_agent", "reporter_agent")
+    },
+}
+
+
+def _time_once(cmd: list[str], env: dict) -> float:
+    t0 = time.perf_counter()
+    subprocess.run(cmd, cwd=ROOT, env=env, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    return time.perf_counter() - t0
+
+
+def main(runs: int, max_seconds: float | None) -> int:
+    env = dict(os.environ)
+    env.setdefault("GOOGLE_API_KEY", "startup-benchmark-placeholder")
+
+    print(f"{'target':<26} {'median':>8} {'min':>8} {'max':>8}")
+    slow = []
+    for label, cmd in TARGETS.items():
+        try:
+            timings = [_time_once(cmd, env) for _ in range(runs)]
+        except subprocess.CalledProcessError as e:
+            err = e.stderr.decode(errors="replace").strip().splitlines()
+            print(f"{label:<26} failed: {err[-1] if err else e}")
+            slow.append(label)
+            continue
+        median = statistics.median(timings)
+        print(f"{label:<26} {median:>7.3f}s {min(timings):>7.3f}s {max(timings):>7.3f}s")
+        if max_seconds is not None and median > max_seconds:
+            slow.append(label)
+
+    if slow:
+        print(f"\n❌ Failed or over budget: {', '.join(slow)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark CLI and agent server cold-start time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=None,
+                        help="exit non-zero if any target's median exceeds this")
+    args = parser.parse_args()
+    sys.exit(main(args.runs, args.max_seconds))
@@ -1,16 +1,31 @@
 # orchestrator.py
+from __future__ import annotations
 import asyncio
 import argparse
+import functools
+import json
 import time
+from contextlib import aclosing
 from uuid import uuid4
-import httpx
 import os
-from a2a.client import A2ACardResolver, A2AClient
-from a2a.types import Message, MessageSendParams, Part, Role, SendMessageRequest, TextPart
+from typing import TYPE_CHECKING, Callable, Optional
 from utils.logger_config import setup_logger
+if TYPE_CHECKING:
+    from a2a.client import A2AClient
+# httpx / a2a / ADK are imported where they are first needed so that CLI
+# start-up (and `--help`) doesn't pay for them.
 logger = setup_logger("Orchestrator")
 # Persistent clients cache
 _clients = {}
+# In-flight agent discoveries, shared by concurrent scans on a cold cache
+_discoveries = {}
+# Persistent in-process ADK runners cache (embedded mode)
+_runners = {}
+
+AGENT_URLS = ("http://localhost:8001",
+              "http://localhost:8002",
+              "http://localhost:8003")
+SCAN_MODES = ("a2a", "embedded")
 
 
 async def get_client_for_agent(base_url: str) -> A2AClient:
@@ -18,10 +33,28 @@ async def get_client_for_agent(base_url: str) -> A2AClient:
     if base_url in _clients:
         return _clients[base_url]
 
+    task = _discoveries.get(base_url)
+    if task is None:
+        task = asyncio.ensure_future(_discover_agent(base_url))
+        _discoveries[base_url] = task
+    # Shielded so one cancelled scan doesn't abort discovery for the others.
+    return await asyncio.shield(task)
+
+
+async def _discover_agent(base_url: str) -> A2AClient:
+    import httpx
+    from a2a.client import A2ACardResolver, A2AClient
+
     logger.info(f"[Orchestrator] 🔍 Discovering agent at {base_url}...")
     httpx_client = httpx.AsyncClient(timeout=httpx.Timeout(180.0))
-    resolver = A2ACardResolver(httpx_client=httpx_client, base_url=base_url)
-    agent_card = await resolver.get_agent_card()
+    try:
+        resolver = A2ACardResolver(httpx_client=httpx_client, base_url=base_url)
+        agent_card = await resolver.get_agent_card()
+    except BaseException:
+        await httpx_client.aclose()
+        raise
+    finally:
+        _discoveries.pop(base_url, None)
     client = A2AClient(httpx_client=httpx_client, agent_card=agent_card)
     _clients[base_url] = client
     logger.info(f"[Orchestrator] ✅ Found agent: {agent_card.name}")
@@ -30,6 +63,8 @@ async def get_client_for_agent(base_url: str) -> A2AClient:
 
 async def _send_text_message(client: A2AClient, text: str) -> str:
     """Send a simple text message and extract its first text response."""
+    from a2a.types import Message, MessageSendParams, Part, Role, SendMessageRequest, TextPart
+
     msg = Message(role=Role.user, messageId=str(uuid4()),
                   parts=[Part(root=TextPart(text=text))])
     req = SendMessageRequest(
@@ -59,43 +94,143 @@ async def _send_text_message(client: A2AClient, text: str) -> str:
     raise RuntimeError("All retries failed")
 
 
-async def run_scan(repo_url: str) -> str:
-    """3-agent workflow with performance optimizations."""
-    scanner, analyzer, reporter = await asyncio.gather(
-        get_client_for_agent("http://localhost:8001"),
-        get_client_for_agent("http://localhost:8002"),
-        get_client_for_agent("http://localhost:8003"),
+def _get_runner(agent):
+    """Fetch or reuse a cached in-process ADK runner for an agent."""
+    if agent.name in _runners:
+        return _runners[agent.name]
+
+    from google.adk.runners import InMemoryRunner
+    logger.info(f"[Orchestrator] 🧩 Loading {agent.name} in-process...")
+    runner = InMemoryRunner(agent=agent, app_name=agent.name)
+    _runners[agent.name] = runner
+    return runner
+
+
+async def _run_agent_inprocess(agent, payload, tool_name: Optional[str] = None):
+    """Run one agent turn through its ADK runner.
+
+    A string payload is handed to the runner as-is. A dict (the scanner's
+    RepoDigest) is serialized here, exactly once, because the model reads
+    text. Nothing is wrapped in an A2A envelope.
+
+    If `tool_name` is given, the run stops as soon as that tool returns, and
+    the tool's result object is returned unchanged. Otherwise the final
+    response text is returned.
+    """
+    from google.genai import types
+
+    runner = _get_runner(agent)
+    text = payload if isinstance(payload, str) else json.dumps(payload)
+    # Fresh session per call, deleted afterwards: InMemorySessionService keeps
+    # every session it creates, digest and all, for the life of the runner.
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name, user_id="orchestrator")
+    msg = types.Content(role="user", parts=[types.Part(text=text)])
+
+    try:
+        final_text = None
+        async with aclosing(runner.run_async(user_id="orchestrator",
+                                             session_id=session.id,
+                                             new_message=msg)) as events:
+            async for event in events:
+                if tool_name:
+                    for fr in event.get_function_responses():
+                        if fr.name == tool_name:
+                            # Don't let the model re-generate a multi-MB result.
+                            return fr.response
+                if event.is_final_response() and event.content and event.content.parts:
+                    final_text = "".join(p.text or "" for p in event.content.parts)
+        if final_text is None:
+            raise RuntimeError(f"{agent.name} returned no final response")
+        return final_text
+    finally:
+        await runner.session_service.delete_session(
+            app_name=runner.app_name, user_id="orchestrator", session_id=session.id)
+
+
+async def _a2a_stages():
+    """Scanner/analyzer/reporter callables that talk to the A2A servers."""
+    clients = await asyncio.gather(*(get_client_for_agent(u) for u in AGENT_URLS))
+    return tuple(functools.partial(_send_text_message, c) for c in clients)
+
+
+async def _embedded_stages():
+    """Scanner/analyzer/reporter callables that run the agents in this process."""
+    from agents import analyzer_agent, reporter_agent, scanner_agent
+    # The scanner stage yields the `scan_repo` dict itself, not the model's echo of it.
+    return (
+        functools.partial(_run_agent_inprocess, scanner_agent.root_agent,
+                          tool_name="scan_repo"),
+        functools.partial(_run_agent_inprocess, analyzer_agent.root_agent),
+        functools.partial(_run_agent_inprocess, reporter_agent.root_agent),
     )
 
+
+def _payload_size(payload) -> int:
+    """Size for logging: a string's length, or a RepoDigest's content length."""
+    if isinstance(payload, str):
+        return len(payload)
+    return len(payload.get("content", ""))
+
+
+async def run_scan(repo_url: str,
+                   on_progress: Optional[Callable[[str], None]] = None,
+                   mode: str = "a2a") -> str:
+    """3-agent workflow with performance optimizations.
+
+    `on_progress`, if given, is called with a short stage label as each stage
+    starts (used by the Streamlit front end to show live progress).
+
+    `mode` is "a2a" (agents run as separate servers on ports 8001-8003) or
+    "embedded" (all three agents run in this process via ADK runners).
+    """
+    def _progress(stage: str) -> None:
+        if on_progress:
+            on_progress(stage)
+
+    if mode == "a2a":
+        scanner, analyzer, reporter = await _a2a_stages()
+    elif mode == "embedded":
+        scanner, analyzer, reporter = await _embedded_stages()
+    else:
+        raise ValueError(f"Unknown scan mode {mode!r}; expected one of {SCAN_MODES}")
+
     t0 = time.time()
-    logger.info(f"\n[Orchestrator] 🚀 Starting scan for {repo_url}")
+    logger.info(f"\n[Orchestrator] 🚀 Starting {mode} scan for {repo_url}")
 
     # Step 1
-    repo_digest = await _send_text_message(scanner, repo_url)
+    _progress("scanning")
+    repo_digest = await scanner(repo_url)
     logger.info(
-        f"[1/3] Scanner complete ({len(repo_digest)} bytes) [{time.time()-t0:.1f}s]")
+        f"[1/3] Scanner complete ({_payload_size(repo_digest)} bytes) [{time.time()-t0:.1f}s]")
 
     # Step 2 + Step 3 (chained)
-    vuln_json = await _send_text_message(analyzer, repo_digest)
+    _progress("analyzing")
+    vuln_json = await analyzer(repo_digest)
     logger.info(
         f"[2/3] Analyzer complete ({len(vuln_json)} bytes) [{time.time()-t0:.1f}s]")
 
-    report_md = await _send_text_message(reporter, vuln_json)
+    _progress("reporting")
+    report_md = await reporter(vuln_json)
     logger.info(f"[3/3] Reporter complete [{time.time()-t0:.1f}s total]")
+    _progress("done")
     return report_md
 
 
-def run_scan_sync(repo_url: str) -> str:
+def run_scan_sync(repo_url: str, mode: str = "a2a") -> str:
     """Sync wrapper for Streamlit / CLI."""
-    return asyncio.run(run_scan(repo_url))
+    return asyncio.run(run_scan(repo_url, mode=mode))
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description="3-Agent Repo Security Scanner")
     parser.add_argument("--url", required=True)
+    parser.add_argument("--mode", choices=SCAN_MODES, default="a2a",
+                        help="a2a: call the agent servers on ports 8001-8003; "
+                             "embedded: run all three agents in this process (CI)")
     args = parser.parse_args()
-    report = run_scan_sync(args.url)
+    report = run_scan_sync(args.url, mode=args.mode)
     logger.info("\n" + "="*60 + "\nFINAL SECURITY REPORT\n" +
                 "="*60 + f"\n\n{report}")
     os.makedirs("reports", exist_ok=True)
@@ -3,7 +3,8 @@
 import streamlit as st
 import time
 from io import BytesIO
-from orchestrator import run_scan_sync
+from uuid import uuid4
+from utils.scan_service import ScanService
 
 st.set_page_config(
     page_title="🛡️ ADK + A2A Repo Security Scanner",
@@ -48,33 +49,76 @@ repo_url = st.text_input(
 
 run_button = st.button("🚀 Run Scan", use_container_width=True)
 
+STAGE_LABELS = {
+    "queued": "⏳ Waiting to start...",
+    "resolving": "🔎 Resolving the repository's latest commit...",
+    "scanning": "📥 [1/3] Scanner is ingesting the repository...",
+    "analyzing": "🧠 [2/3] Analyzer is reviewing the code...",
+    "reporting": "📝 [3/3] Reporter is writing the report...",
+    "done": "✅ Finishing up...",
+}
+
+
+@st.cache_resource
+def get_scan_service() -> ScanService:
+    """One background scan service shared by every browser session."""
+    return ScanService()
+
+
+service = get_scan_service()
+# Identifies this browser session to the shared service, so cancelling only
+# drops our interest in a scan other sessions may also be waiting on.
+session_id = st.session_state.setdefault("session_id", str(uuid4()))
+
 # --- Main Scan Logic ---
 if run_button:
     if not repo_url.strip():
         st.error("⚠️ Please enter a GitHub repository URL.")
     else:
-        with st.spinner("🧠 Scanning your repository using 3-agent pipeline..."):
-            try:
-                start_time = time.time()
-                report_md = run_scan_sync(repo_url.strip())
-                end_time = time.time()
-
-                st.success(
-                    f"✅ Scan complete! (took {end_time - start_time:.1f}s)")
-
-                with st.expander("📜 View Security Report (Markdown)", expanded=True):
-                    st.markdown(report_md)
-
-                # --- Download section ---
-                st.download_button(
-                    label="💾 Download Markdown Report",
-                    data=BytesIO(report_md.encode("utf-8")),
-                    file_name=f"security_report_{repo_url.split('/')[-1]}.md",
-                    mime="text/markdown",
-                    use_container_width=True,
-                )
-
-            except Exception as e:
-                st.error(f"❌ Scan failed: {e}")
-                st.info(
-                    "Tip: Check if all agents (8001, 8002, 8003) are running properly.")
+        try:
+            job = service.submit(repo_url.strip(), session_id)
+            st.session_state["scan_job_id"] = job.job_id
+            st.session_state.pop("scan_cancelled", None)
+        except ValueError as e:
+            st.error(f"⚠️ {e}")
+
+job_id = st.session_state.get("scan_job_id", "")
+job = service.get(job_id)
+
+if job is not None and not job.finished:
+    st.info(f"{STAGE_LABELS.get(job.stage, job.stage)} ({job.elapsed:.0f}s elapsed)")
+    if st.button("🛑 Cancel Scan", use_container_width=True):
+        service.cancel(job_id, session_id)
+        st.session_state.pop("scan_job_id", None)
+        st.session_state["scan_cancelled"] = True
+        st.rerun()
+    # Poll the background job without blocking other sessions.
+    time.sleep(1)
+    st.rerun()
+
+elif st.session_state.get("scan_cancelled"):
+    st.warning("🛑 Scan cancelled.")
+
+elif job is not None and job.status == "done":
+    report_md = job.report_md
+    st.success(f"✅ Scan complete! (took {job.elapsed:.1f}s)")
+
+    with st.expander("📜 View Security Report (Markdown)", expanded=True):
+        st.markdown(report_md)
+
+    # --- Download section ---
+    st.download_button(
+        label="💾 Download Markdown Report",
+        data=BytesIO(report_md.encode("utf-8")),
+        file_name=f"security_report_{job.repo_url.split('/')[-1]}.md",
+        mime="text/markdown",
+        use_container_width=True,
+    )
+
+elif job is not None and job.status == "cancelled":
+    st.warning("🛑 Scan cancelled.")
+
+elif job is not None and job.status == "failed":
+    st.error(f"❌ Scan failed: {job.error}")
+    st.info(
+        "Tip: Check if all agents (8001, 8002, 8003) are running properly.")
@@ -1,23 +1,76 @@
 # utils/gemini_config.py
+"""
+Shared Gemini / ADK configuration for every agent and the orchestrator.
+
+Nothing heavy happens at import time: `.env` is loaded, the API key is
+resolved, and `google.generativeai` models are built only on first use.
+"""
 
+import functools
 import os
-import google.generativeai as genai
-from google.generativeai.types import GenerationConfig
-from utils.schemas import AnalysisSchema
+from typing import Any, Callable, Tuple
 
-from dotenv import load_dotenv
-load_dotenv()
 
-# Prefer GOOGLE_API_KEY (used by ADK) but fall back to GEMINI_API_KEY for flexibility
-GEMINI_API_KEY = os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
+@functools.lru_cache(maxsize=None)
+def load_env() -> None:
+    """Load `.env` into the process environment (once)."""
+    from dotenv import load_dotenv
+    load_dotenv()
 
-if not GEMINI_API_KEY:
-    raise ValueError(
-        "No Gemini API key found. Set GOOGLE_API_KEY or GEMINI_API_KEY in your environment or .env file."
-    )
 
-genai.configure(api_key=GEMINI_API_KEY)
-print("[Config] Gemini API key configured.", GEMINI_API_KEY)
+@functools.lru_cache(maxsize=None)
+def get_api_key() -> str:
+    """Resolve the Gemini API key and expose it to ADK as GOOGLE_API_KEY."""
+    load_env()
+    # Prefer GOOGLE_API_KEY (used by ADK) but fall back to GEMINI_API_KEY for flexibility
+    api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
+
+    if not api_key:
+        raise ValueError(
+            "No Gemini API key found. Set GOOGLE_API_KEY or GEMINI_API_KEY in your environment or .env file."
+        )
+    os.environ.setdefault("GOOGLE_API_KEY", api_key)
+    return api_key
+
+
+@functools.lru_cache(maxsize=None)
+def configure_genai():
+    """Import and configure `google.generativeai` (once) and return the module."""
+    import google.generativeai as genai
+    genai.configure(api_key=get_api_key())
+    return genai
+
+
+def lazy_agent_module(build_agent: Callable[[], Any], port: int) -> Tuple[Callable, Callable]:
+    """
+    Lazy `root_agent` / `a2a_app` wiring for an agent module.
+
+    `build_agent` only constructs the ADK `Agent`. Use in the agent module as:
+        build_a2a_app, __getattr__ = lazy_agent_module(_build_agent, port=8001)
+    so uvicorn, ADK and the orchestrator build them on first attribute access.
+    """
+    module_name = build_agent.__module__
+
+    @functools.lru_cache(maxsize=None)
+    def build_root_agent():
+        get_api_key()  # fail fast + make GOOGLE_API_KEY visible to ADK
+        return build_agent()
+
+    @functools.lru_cache(maxsize=None)
+    def build_a2a_app():
+        from google.adk.a2a.utils.agent_to_a2a import to_a2a
+
+        return to_a2a(build_root_agent(), port=port)
+
+    def __getattr__(name: str):
+        if name == "root_agent":
+            return build_root_agent()
+        if name == "a2a_app":
+            return build_a2a_app()
+        raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+
+    return build_a2a_app, __getattr__
+
 
 VULN_ANALYSIS_SYSTEM_PROMPT = """
 You are a senior application security engineer.
@@ -91,23 +144,54 @@ Use:
 Be concise and technical.
 """
 
-JSON_GENERATION_CONFIG = GenerationConfig(
-    response_mime_type="application/json",
-    response_schema=AnalysisSchema,  # enforce RepoVulnerabilityReport
-)
-
-TEXT_GENERATION_CONFIG = GenerationConfig(
-    response_mime_type="text/plain",
-)
-
-vuln_analysis_model = genai.GenerativeModel(
-    "gemini-1.5-pro",
-    system_instruction=VULN_ANALYSIS_SYSTEM_PROMPT,
-    generation_config=JSON_GENERATION_CONFIG,
-)
-
-report_formatter_model = genai.GenerativeModel(
-    "gemini-1.5-flash",
-    system_instruction=REPORT_FORMATTER_SYSTEM_PROMPT,
-    generation_config=TEXT_GENERATION_CONFIG,
-)
+
+@functools.lru_cache(maxsize=None)
+def get_json_generation_config():
+    from google.generativeai.types import GenerationConfig
+    from utils.schemas import AnalysisSchema
+
+    return GenerationConfig(
+        response_mime_type="application/json",
+        response_schema=AnalysisSchema,  # enforce RepoVulnerabilityReport
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_text_generation_config():
+    from google.generativeai.types import GenerationConfig
+
+    return GenerationConfig(response_mime_type="text/plain")
+
+
+@functools.lru_cache(maxsize=None)
+def get_vuln_analysis_model():
+    return configure_genai().GenerativeModel(
+        "gemini-1.5-pro",
+        system_instruction=VULN_ANALYSIS_SYSTEM_PROMPT,
+        generation_config=get_json_generation_config(),
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_report_formatter_model():
+    return configure_genai().GenerativeModel(
+        "gemini-1.5-flash",
+        system_instruction=REPORT_FORMATTER_SYSTEM_PROMPT,
+        generation_config=get_text_generation_config(),
+    )
+
+
+# Old eager module attributes, now built on first access.
+_LAZY_ATTRS = {
+    "GEMINI_API_KEY": get_api_key,
+    "JSON_GENERATION_CONFIG": get_json_generation_config,
+    "TEXT_GENERATION_CONFIG": get_text_generation_config,
+    "vuln_analysis_model": get_vuln_analysis_model,
+    "report_formatter_model": get_report_formatter_model,
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRS:
+        return _LAZY_ATTRS[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
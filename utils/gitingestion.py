@@ -71,13 +71,9 @@ from dataclasses import dataclass
 from typing import Dict, Any
 import asyncio
 import concurrent.futures
-from gitingest import ingest, ingest_async
+from typing import Optional
+from utils.gemini_config import load_env
 from utils.logger_config import setup_logger
-import os
-from dotenv import load_dotenv
-load_dotenv()
-github_token = os.getenv("GITHUB_TOKEN",None)
-    
 
 logger = setup_logger("Gitingest")
 
@@ -98,6 +94,8 @@ class RepoDigest:
 
 async def _ingest_async(repo_url: str) -> RepoDigest:
     """Async version — safe for uvicorn/ADK loops."""
+    from gitingest import ingest, ingest_async  # heavy; only needed when scanning
+    load_env()  # GITHUB_TOKEN for private repos
     logger.info(f"Starting async ingest for repo: {repo_url}")
     try:
         if callable(ingest_async):
@@ -124,6 +122,8 @@ def gitingest_repo(repo_url: str) -> RepoDigest:
 
     # Inside ADK / Uvicorn event loop → use thread off-load
     if loop and loop.is_running():
+        from gitingest import ingest
+        load_env()
         logger.info("Detected existing async loop — off-loading ingest() to background thread.")
         with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
             future = pool.submit(ingest, repo_url)
@@ -135,6 +135,41 @@ def gitingest_repo(repo_url: str) -> RepoDigest:
     return asyncio.run(_ingest_async(repo_url))
 
 
+async def resolve_head_commit(repo_url: str, timeout: float = 15.0) -> Optional[str]:
+    """
+    Best-effort lookup of the remote HEAD commit via `git ls-remote`.
+    Runs as an async subprocess so callers on an event loop never block.
+    Returns None if git is unavailable or the remote can't be reached.
+    """
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            # "--" stops a URL like "--upload-pack=..." being parsed as an option.
+            "git", "ls-remote", "--", repo_url, "HEAD",
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+        )
+    except OSError as e:
+        logger.warning(f"Could not resolve HEAD commit for {repo_url}: {e}")
+        return None
+
+    try:
+        out, err = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+    except BaseException as e:
+        # Timed out or the scan was cancelled — don't leave git running.
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        if isinstance(e, asyncio.TimeoutError):
+            logger.warning(f"Timed out resolving HEAD commit for {repo_url}")
+            return None
+        raise
+
+    if proc.returncode != 0:
+        logger.warning(
+            f"Could not resolve HEAD commit for {repo_url}: {err.decode(errors='replace').strip()}")
+        return None
+    out = out.decode(errors="replace")
+    return out.split()[0] if out.strip() else None
+
 if __name__ == "__main__":
     test_repo = "https://github.com/ADITYAMAHAKALI/gdg-vuln-sample-repo"
     digest = gitingest_repo(test_repo)
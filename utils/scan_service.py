@@ -0,0 +1,194 @@
+# utils/scan_service.py
+
+from __future__ import annotations
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Set, Tuple
+from urllib.parse import urlparse
+from uuid import uuid4
+from orchestrator import run_scan
+from utils.gitingestion import resolve_head_commit
+from utils.logger_config import setup_logger
+
+logger = setup_logger("ScanService")
+
+
+@dataclass(eq=False)
+class ScanJob:
+    job_id: str
+    repo_url: str
+    commit: Optional[str] = None  # resolved by the background job
+    status: str = "queued"      # "queued" | "running" | "done" | "failed" | "cancelled"
+    stage: str = "queued"       # "resolving", then the last stage reported by run_scan()
+    started_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    report_md: Optional[str] = None
+    error: Optional[str] = None
+    waiters: Set[str] = field(default_factory=set, repr=False)  # session ids
+    future: Optional[Future] = field(default=None, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed", "cancelled")
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.time()) - self.started_at
+
+
+class ScanService:
+    """
+    Runs scans on one shared background event loop so that UI sessions never
+    block, all scans share the same cached A2A clients, and requests for the
+    same repo URL + commit reuse an in-flight or finished job.
+
+    Finished jobs are kept for `finished_ttl` seconds, and at most
+    `max_finished` of them are kept at once.
+    """
+
+    def __init__(self, finished_ttl: float = 3600.0, max_finished: int = 50) -> None:
+        self._finished_ttl = finished_ttl
+        self._max_finished = max_finished
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="scan-service-loop", daemon=True)
+        self._thread.start()
+        self._lock = threading.Lock()
+        # Job id -> job. A job merged into an existing scan keeps its id here,
+        # pointing at the scan it joined.
+        self._jobs: Dict[str, ScanJob] = {}
+        self._by_key: Dict[Tuple[str, Optional[str]], ScanJob] = {}
+
+    def submit(self, repo_url: str, session_id: str) -> ScanJob:
+        """
+        Queue a scan on behalf of `session_id` and return immediately.
+        The commit lookup and de-duplication happen on the background loop.
+        """
+        parsed = urlparse(repo_url)
+        if parsed.scheme != "https" or not parsed.netloc:
+            raise ValueError(f"Only https:// repository URLs can be scanned: {repo_url!r}")
+
+        with self._lock:
+            self._prune()
+            # A session waits on one scan at a time: leave any other unfinished
+            # scan, unless it is already waiting on this very URL.
+            for other in {j for j in self._jobs.values()
+                          if session_id in j.waiters and not j.finished}:
+                if other.repo_url == repo_url:
+                    return other
+                self._leave(other, session_id)
+
+            job = ScanJob(job_id=str(uuid4()), repo_url=repo_url, waiters={session_id})
+            self._jobs[job.job_id] = job
+            job.future = asyncio.run_coroutine_threadsafe(
+                self._run(job), self._loop)
+            job.future.add_done_callback(lambda f: self._on_done(job, f))
+        logger.info(f"🚀 Queued scan {job.job_id} for {repo_url}")
+        return job
+
+    def get(self, job_id: str) -> Optional[ScanJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str, session_id: str) -> bool:
+        """
+        Withdraw `session_id`'s interest in a scan. The scan itself is only
+        cancelled once no other session is waiting on it.
+        Returns False if the job is unknown or already finished.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished or job.future is None:
+                return False
+            return self._leave(job, session_id)
+
+    def _leave(self, job: ScanJob, session_id: str) -> bool:
+        """Drop `session_id` from `job`, cancelling it if nobody is left. Caller holds the lock."""
+        job.waiters.discard(session_id)
+        if job.waiters:
+            logger.info(
+                f"👋 Session left scan {job.job_id}; {len(job.waiters)} still waiting")
+            return True
+        logger.info(f"🛑 Cancelling scan {job.job_id}")
+        return job.future.cancel()
+
+    async def _run(self, job: ScanJob) -> None:
+        def _on_progress(stage: str) -> None:
+            job.stage = stage
+
+        try:
+            job.stage = "resolving"
+            commit = await resolve_head_commit(job.repo_url)
+            key = (job.repo_url, commit)
+            with self._lock:
+                existing = self._by_key.get(key)
+                if existing is not None and self._reusable(existing, commit):
+                    existing.waiters |= job.waiters
+                    self._jobs[job.job_id] = existing
+                    logger.info(
+                        f"♻️ Reusing {existing.status} scan {existing.job_id} for {job.repo_url}@{commit}")
+                    return
+                # A failed/cancelled job for this key stays in `_jobs` for anyone
+                # still viewing it; pruning reclaims it later.
+                job.commit = commit
+                self._by_key[key] = job
+
+            job.status = "running"
+            job.report_md = await run_scan(job.repo_url, on_progress=_on_progress)
+            job.status = "done"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            raise
+        except Exception as e:
+            logger.error(f"❌ Scan {job.job_id} failed: {e}")
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+
+    @staticmethod
+    def _reusable(job: ScanJob, commit: Optional[str]) -> bool:
+        if job.status in ("failed", "cancelled") or job.future.cancelled():
+            return False
+        # Without a commit we can't tell if a finished report is stale,
+        # so only piggy-back on scans that are still running.
+        return commit is not None or not job.finished
+
+    def _evict(self, job: ScanJob) -> None:
+        """Drop every reference to `job`. Caller holds the lock."""
+        for job_id in [i for i, j in self._jobs.items() if j is job]:
+            del self._jobs[job_id]
+        for key in [k for k, j in self._by_key.items() if j is job]:
+            del self._by_key[key]
+
+    def _prune(self) -> None:
+        """Evict expired finished jobs and enforce `max_finished`. Caller holds the lock."""
+        now = time.time()
+        finished = {j for j in self._jobs.values() if j.finished}
+        expired = {j for j in finished
+                   if now - (j.finished_at or now) > self._finished_ttl}
+        newest = sorted(finished - expired,
+                        key=lambda j: j.finished_at or now, reverse=True)
+        expired.update(newest[self._max_finished:])
+        for job in expired:
+            self._evict(job)
+        if expired:
+            logger.info(f"🧹 Evicted {len(expired)} finished scan(s)")
+
+    @staticmethod
+    def _on_done(job: ScanJob, future: Future) -> None:
+        # Covers jobs cancelled before their coroutine got a chance to start,
+        # and anything that escaped `_run`, so the page never polls forever.
+        if job.finished:
+            return
+        if future.cancelled():
+            job.status = "cancelled"
+        elif future.exception() is not None:
+            job.error = str(future.exception())
+            job.status = "failed"
+        else:
+            return
+        job.finished_at = time.time()